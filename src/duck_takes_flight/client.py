@@ -3,15 +3,24 @@ DuckDB Flight Client implementation.
 """
 
 import logging
+import random
 import time
 from typing import Optional
 
 import polars as pl
+import pyarrow as pa
 import pyarrow.flight as flight
 from pyarrow._flight import FlightUnavailableError
 
 from .logging import logger as default_logger
 
+# Raise gRPC's 4 MB default message cap so large Arrow batches travel in
+# few fat frames instead of many small ones.
+_GRPC_OPTIONS = [
+    ("grpc.max_send_message_length", 256 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 256 * 1024 * 1024),
+]
+
 
 class DuckDBFlightClient:
     """
@@ -24,6 +33,7 @@ class DuckDBFlightClient:
         port=8815,
         max_attempts=5,
         logger: Optional[logging.Logger] = None,
+        reuse_writers=False,
     ):
         """
         Initialize the DuckDB Flight client.
@@ -33,9 +43,18 @@ class DuckDBFlightClient:
             port: The port to connect to.
             max_attempts: The maximum number of connection attempts.
             logger: Optional logger instance.
+            reuse_writers: If True, keep one PUT writer open per
+                (table, schema) and stream into it across upload_data
+                calls instead of opening a new stream each time. The
+                server inserts each batch as it arrives, so uploads
+                become visible as they land; flush() (or close()) only
+                completes the stream and confirms the server consumed
+                everything.
         """
         self.location = f"grpc://{host}:{port}"
         self.logger = logger or default_logger
+        self.reuse_writers = reuse_writers
+        self._writers = {}
         self.client = self.connect_with_retry(max_attempts)
 
     def connect_with_retry(self, max_attempts=5):
@@ -53,15 +72,24 @@ class DuckDBFlightClient:
         """
         for attempt in range(max_attempts):
             try:
-                client = flight.connect(self.location)
+                client = flight.connect(self.location, generic_options=_GRPC_OPTIONS)
+                # connect() is lazy, so block on channel readiness here:
+                # the client wakes the instant the server is up instead of
+                # discovering an unavailable server on its first RPC.
+                client.wait_for_available(timeout=5)
                 self.logger.info(f"Connected to Flight server at {self.location}")
                 return client
             except FlightUnavailableError:
                 if attempt < max_attempts - 1:
+                    # Exponential backoff with jitter: retries start fast
+                    # for quick server restarts and spread out so clients
+                    # launched together don't retry in lockstep.
+                    delay = min(30, 0.1 * 2**attempt) * random.uniform(0.5, 1.5)
                     self.logger.warning(
-                        f"Connection attempt {attempt + 1} failed, retrying in 1 second..."
+                        f"Connection attempt {attempt + 1} failed, "
+                        f"retrying in {delay:.2f} seconds..."
                     )
-                    time.sleep(1)
+                    time.sleep(delay)
                 else:
                     self.logger.error(
                         f"Failed to connect to {self.location} after {max_attempts} attempts"
@@ -102,6 +130,61 @@ class DuckDBFlightClient:
             self.logger.error(f"Query error: {str(e)}")
             return None
 
+    def execute_query_stream(self, query):
+        """
+        Execute a query and yield result record batches as they arrive.
+
+        Unlike execute_query this never concatenates the result into a
+        single table, so aggregations and scans over large results can
+        consume batches with bounded memory.
+
+        Args:
+            query: The SQL query to execute.
+
+        Yields:
+            PyArrow RecordBatch objects.
+        """
+        self.logger.debug(f"Executing streaming query: {query}")
+        ticket = flight.Ticket(query.encode("utf-8"))
+        reader = self.client.do_get(ticket)
+        for chunk in reader:
+            yield chunk.data
+
+    def execute_queries(self, queries):
+        """
+        Execute several queries in a single round-trip via DoExchange.
+
+        The queries travel to the server as one record batch and each
+        result comes back IPC-serialized in the response stream, so N
+        queries cost one gRPC call instead of N.
+
+        Args:
+            queries: A list of SQL query strings.
+
+        Returns:
+            A list of PyArrow Tables, one per query in order, or None if
+            an error occurs.
+        """
+        try:
+            self.logger.debug(f"Executing {len(queries)} queries in one exchange")
+            descriptor = flight.FlightDescriptor.for_command(b"batch_query")
+            writer, reader = self.client.do_exchange(descriptor)
+            batch = pa.record_batch({"sql": pa.array(queries, type=pa.string())})
+            writer.begin(batch.schema)
+            writer.write_batch(batch)
+            writer.done_writing()
+
+            results = [None] * len(queries)
+            for chunk in reader:
+                for row in chunk.data.to_pylist():
+                    with pa.ipc.open_stream(row["data"]) as ipc_reader:
+                        results[row["query_id"]] = ipc_reader.read_all()
+            writer.close()
+            return results
+        except Exception as e:
+            self.logger.error(f"Exchange error: {str(e)}")
+            return None
+
     def execute_query_to_polars(self, query):
         """
         Execute a query on the Flight server and return the result as a Polars DataFrame.
@@ -124,7 +207,9 @@ class DuckDBFlightClient:
 
                 return pl.DataFrame()
 
-            df = pl.from_arrow(arrow_table)
+            # rechunk=False lets Polars adopt the Arrow buffers as-is
+            # instead of copying them into contiguous chunks.
+            df = pl.from_arrow(arrow_table, rechunk=False)
             self.logger.debug(
                 f"Converted PyArrow table to Polars DataFrame with {len(df)} rows"
             )
@@ -146,17 +231,129 @@ class DuckDBFlightClient:
             True if the upload was successful, False otherwise.
         """
         try:
-            self.logger.info(f"Uploading {table.num_rows} rows to table {table_name}")
-            descriptor = flight.FlightDescriptor.for_path(table_name)
-            writer, _ = self.client.do_put(descriptor, table.schema)
-            writer.write_table(table)
-            writer.close()
-            self.logger.info(f"Successfully uploaded data to {table_name}")
+            self.logger.debug(f"Uploading {table.num_rows} rows to table {table_name}")
+            if self.reuse_writers:
+                writer = self._get_writer(table_name, table.schema)
+                try:
+                    writer.write_table(table)
+                except Exception:
+                    # A failed write leaves the stream unusable; evict it
+                    # so the next upload opens a fresh one.
+                    self._evict_writer(table_name, table.schema)
+                    raise
+            else:
+                descriptor = flight.FlightDescriptor.for_path(table_name)
+                writer, _ = self.client.do_put(descriptor, table.schema)
+                writer.write_table(table)
+                writer.close()
+            self.logger.debug(f"Successfully uploaded data to {table_name}")
             return True
         except Exception as e:
             self.logger.error(f"Error uploading data: {str(e)}")
             return False
 
+    def upload_batch(self, table_name, batch):
+        """
+        Upload a single PyArrow RecordBatch to the Flight server.
+
+        Fast path for producers that already build record batches; the
+        batch goes straight to the writer without being wrapped in a
+        Table and re-chunked.
+
+        Args:
+            table_name: The name of the table to upload to.
+            batch: A PyArrow RecordBatch containing the data to upload.
+
+        Returns:
+            True if the upload was successful, False otherwise.
+        """
+        try:
+            self.logger.debug(f"Uploading {batch.num_rows} rows to table {table_name}")
+            if self.reuse_writers:
+                writer = self._get_writer(table_name, batch.schema)
+                try:
+                    writer.write_batch(batch)
+                except Exception:
+                    # A failed write leaves the stream unusable; evict it
+                    # so the next upload opens a fresh one.
+                    self._evict_writer(table_name, batch.schema)
+                    raise
+            else:
+                descriptor = flight.FlightDescriptor.for_path(table_name)
+                writer, _ = self.client.do_put(descriptor, batch.schema)
+                writer.write_batch(batch)
+                writer.close()
+            self.logger.debug(f"Successfully uploaded data to {table_name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error uploading data: {str(e)}")
+            return False
+
+    def _get_writer(self, table_name, schema):
+        """
+        Look up or open a long-lived PUT writer for a table/schema pair.
+
+        Args:
+            table_name: The name of the table to upload to.
+            schema: The PyArrow schema of the data being uploaded.
+
+        Returns:
+            An open FlightStreamWriter for the table.
+        """
+        key = (table_name, schema.serialize().to_pybytes())
+        writer = self._writers.get(key)
+        if writer is None:
+            descriptor = flight.FlightDescriptor.for_path(table_name)
+            writer, _ = self.client.do_put(descriptor, schema)
+            self._writers[key] = writer
+        return writer
+
+    def _evict_writer(self, table_name, schema):
+        """
+        Drop a cached PUT writer whose stream is broken.
+
+        Args:
+            table_name: The name of the table the writer uploads to.
+            schema: The PyArrow schema the writer was opened with.
+        """
+        key = (table_name, schema.serialize().to_pybytes())
+        writer = self._writers.pop(key, None)
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                # The stream already failed; closing is best-effort.
+                pass
+
+    def flush(self):
+        """
+        Close any long-lived PUT writers, completing their uploads.
+
+        Every writer is closed even if one raises; the first error is
+        re-raised once the rest have been dealt with, and the writer
+        cache is always cleared so later uploads start fresh streams.
+        """
+        first_error = None
+        try:
+            for writer in self._writers.values():
+                try:
+                    writer.close()
+                except Exception as e:
+                    self.logger.error(f"Error closing writer: {str(e)}")
+                    if first_error is None:
+                        first_error = e
+        finally:
+            self._writers.clear()
+        if first_error is not None:
+            raise first_error
+
+    def close(self):
+        """
+        Flush outstanding writers and close the underlying Flight client.
+        """
+        self.flush()
+        self.client.close()
+
     def execute_action(self, action_type, body=None):
         """
         Execute a custom action on the Flight server.
@@ -3,6 +3,10 @@ DuckDB Flight Server implementation.
 """
 
 import logging
+import os
+import re
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 import duckdb
@@ -11,6 +15,88 @@ import pyarrow.flight as flight
 
 from .logging import logger as default_logger
 
+# Table names arrive over the wire; only plain identifiers are accepted so
+# they can be safely quoted into DDL without SQL injection.
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Upper bound on cached query plans; past this the least recently used
+# entry is evicted so ad-hoc queries can't grow the cache unboundedly.
+_PLAN_CACHE_SIZE = 128
+
+# Response schema for batched-query exchanges: one row per query, with
+# the result table serialized as an Arrow IPC stream in `data`.
+_EXCHANGE_SCHEMA = pa.schema([("query_id", pa.int32()), ("data", pa.binary())])
+
+# Compress GET result batches on the wire; lz4 trades a little CPU at
+# ~GB/s for far fewer bytes per gRPC frame, and IPC compression is
+# self-describing so clients decode it without any configuration.
+_IPC_WRITE_OPTIONS = pa.ipc.IpcWriteOptions(compression="lz4")
+
+# Bounds for the query-result cache: at most this many entries, and only
+# results small enough to be worth pinning in memory.
+_RESULT_CACHE_SIZE = 32
+_RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+# Target payload per streamed result batch: big enough to amortize gRPC
+# framing, small enough to keep per-batch memory bounded. Row counts are
+# clamped so degenerate schemas can't produce absurd batch sizes.
+_TARGET_BATCH_BYTES = 2 * 1024 * 1024
+_MIN_BATCH_ROWS = 1024
+_MAX_BATCH_ROWS = 65536
+
+# Rough per-value byte widths for common DuckDB column types; anything
+# variable-width or unknown gets a conservative estimate.
+_DUCKDB_TYPE_BYTES = {
+    "BOOLEAN": 1,
+    "TINYINT": 1,
+    "SMALLINT": 2,
+    "INTEGER": 4,
+    "FLOAT": 4,
+    "DATE": 4,
+    "BIGINT": 8,
+    "UBIGINT": 8,
+    "DOUBLE": 8,
+    "TIMESTAMP": 8,
+    "TIME": 8,
+}
+_DEFAULT_COLUMN_BYTES = 16
+
+
+def _batch_rows_for(rel):
+    """Pick a result batch row count targeting ~2 MiB per batch."""
+    bytes_per_row = sum(
+        _DUCKDB_TYPE_BYTES.get(str(column_type), _DEFAULT_COLUMN_BYTES)
+        for column_type in rel.types
+    )
+    rows = _TARGET_BATCH_BYTES // max(1, bytes_per_row)
+    return max(_MIN_BATCH_ROWS, min(_MAX_BATCH_ROWS, rows))
+
+
+# DuckDB allows WITH ... INSERT/UPDATE/DELETE, so a WITH prefix alone
+# does not make a statement read-only.
+_WRITE_KEYWORD_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def _is_read_only(query):
+    """Return True if the query looks like an idempotent SELECT.
+
+    A WITH-prefixed statement only counts as read-only if it contains no
+    write keyword. The scan can misflag a SELECT that merely mentions
+    such a word, but that only costs it the streaming/caching fast path;
+    misclassifying a write as read-only would skip locking and cache
+    invalidation, so the check errs on the side of writes.
+    """
+    parts = query.lstrip().split(None, 1)
+    if not parts:
+        return False
+    head = parts[0].upper()
+    if head == "SELECT":
+        return True
+    if head == "WITH":
+        return not _WRITE_KEYWORD_RE.search(query)
+    return False
+
 
 class DuckDBFlightServer(flight.FlightServerBase):
     """
@@ -34,8 +120,67 @@ class DuckDBFlightServer(flight.FlightServerBase):
         super().__init__(location)
         self.db_path = db_path
         self.conn = duckdb.connect(db_path)
+        # Tune the connection for Arrow-heavy workloads: use every core,
+        # skip the ordering pass DuckDB otherwise pays to keep insertion
+        # order on scans, and honor an optional memory cap from the
+        # environment.
+        self.conn.execute(f"PRAGMA threads={os.cpu_count()}")
+        self.conn.execute("PRAGMA preserve_insertion_order=false")
+        memory_limit = os.environ.get("DUCK_FLIGHT_MEMORY_LIMIT")
+        if memory_limit:
+            self.conn.execute(f"PRAGMA memory_limit='{memory_limit}'")
+        # Table name -> serialized Arrow schema of the last PUT; lets the
+        # hot PUT path skip DDL when the fingerprint matches. Existing
+        # tables are seeded with an unknown (None) fingerprint.
+        self._ddl_cache = {
+            row[0]: None
+            for row in self.conn.execute(
+                "SELECT table_name FROM information_schema.tables"
+            ).fetchall()
+        }
+        # One cursor per gRPC worker thread; writers are serialized with
+        # a lock while readers stay lock-free. The thread-local also
+        # carries a per-thread relation cache (see _thread_plans).
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # Small SELECT results keyed by query text, invalidated whenever
+        # a PUT or a non-SELECT action changes data. The generation
+        # counter stamps in-flight queries so a result computed before an
+        # invalidation is never inserted after it.
+        self._result_cache = OrderedDict()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
         self.logger = logger or default_logger
-        self.logger.info(f"Connected to DuckDB database at {db_path}")
+        self.logger.info("Connected to DuckDB database at %s", db_path)
+
+    def _cursor(self):
+        """
+        Return this thread's DuckDB cursor, creating it on first use.
+
+        Cursors share the database handle but execute independently, so
+        concurrent RPCs don't serialize on a single connection.
+        """
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    def _thread_plans(self):
+        """
+        Return this thread's relation cache, creating it on first use.
+
+        Parsed/bound relations are keyed by query text (LRU-bounded) so
+        repeated queries skip DuckDB's parse and bind phases on hits. A
+        relation is tied to the cursor that created it and re-executing
+        one is not thread-safe, so each gRPC thread keeps its own cache
+        instead of sharing one dict (which would also need locking).
+        """
+        plans = getattr(self._local, "plans", None)
+        if plans is None:
+            plans = OrderedDict()
+            self._local.plans = plans
+        return plans
 
     def do_get(self, context, ticket):
         """
@@ -46,17 +191,96 @@ class DuckDBFlightServer(flight.FlightServerBase):
             ticket: The ticket containing the query.
 
         Returns:
-            A RecordBatchStream containing the query results.
+            A GeneratorStream yielding the query results batch by batch.
         """
         query = ticket.ticket.decode("utf-8")
-        self.logger.debug(f"Executing query: {query}")
-        result_table = self.conn.execute(query).fetch_arrow_table()
-        # Convert to record batches with alignment
-        batches = result_table.to_batches(
-            max_chunksize=1024
-        )  # Use power of 2 for alignment
-        self.logger.debug(f"Query returned {result_table.num_rows} rows")
-        return flight.RecordBatchStream(pa.Table.from_batches(batches))
+        self.logger.debug("Executing query: %s", query)
+        if not _is_read_only(query):
+            # DDL/DML can arrive as GET tickets too. sql() returns no
+            # relation for those, so go through execute() (which yields
+            # an empty result), and serialize with other writers and
+            # invalidate cached results the same way do_action does.
+            with self._write_lock:
+                result = self._cursor().execute(query).fetch_arrow_table()
+            self._invalidate_result_cache()
+            return flight.RecordBatchStream(result, options=_IPC_WRITE_OPTIONS)
+        with self._cache_lock:
+            cached = self._result_cache.get(query)
+            if cached is not None:
+                self._result_cache.move_to_end(query)
+            generation = self._cache_generation
+        if cached is not None:
+            self.logger.debug("Result cache hit for query: %s", query)
+            return flight.RecordBatchStream(cached, options=_IPC_WRITE_OPTIONS)
+
+        # Stream batches straight from DuckDB's executor to the Flight
+        # writer instead of materializing the full result table; peak
+        # memory is one batch and the first batch goes out immediately.
+        plans = self._thread_plans()
+        rel = plans.get(query)
+        if rel is None:
+            # Each cached relation owns its own cursor so re-executing it
+            # doesn't serialize on the shared connection.
+            rel = self.conn.cursor().sql(query)
+            if rel is None:
+                # A write slipped past _is_read_only; sql() has already
+                # executed it and returned no relation. Don't cache it,
+                # drop any results it staled, and return an empty stream.
+                self._invalidate_result_cache()
+                return flight.RecordBatchStream(
+                    pa.table({}), options=_IPC_WRITE_OPTIONS
+                )
+            plans[query] = rel
+            if len(plans) > _PLAN_CACHE_SIZE:
+                plans.popitem(last=False)
+        else:
+            plans.move_to_end(query)
+        reader = rel.fetch_record_batch(_batch_rows_for(rel))
+        # Tee small results into the cache while streaming them out.
+        batches = self._stream_and_cache(query, reader, generation)
+        return flight.GeneratorStream(reader.schema, batches, options=_IPC_WRITE_OPTIONS)
+
+    def _stream_and_cache(self, query, reader, generation):
+        """
+        Yield batches from a reader, caching the full result if small.
+
+        Accumulation stops as soon as the result exceeds the size cap, so
+        large results stream through without being pinned in memory. The
+        result is only inserted if no invalidation happened while it was
+        streaming; otherwise a write that landed mid-stream would have
+        its invalidation overwritten by this pre-write result.
+
+        Args:
+            query: The query text used as the cache key.
+            reader: The RecordBatchReader producing the result.
+            generation: The cache generation when the query started.
+
+        Yields:
+            PyArrow RecordBatch objects.
+        """
+        batches = []
+        cached_bytes = 0
+        for batch in reader:
+            if batches is not None:
+                cached_bytes += batch.nbytes
+                if cached_bytes <= _RESULT_CACHE_MAX_BYTES:
+                    batches.append(batch)
+                else:
+                    batches = None
+            yield batch
+        if batches is not None:
+            result = pa.Table.from_batches(batches, schema=reader.schema)
+            with self._cache_lock:
+                if self._cache_generation == generation:
+                    self._result_cache[query] = result
+                    if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+
+    def _invalidate_result_cache(self):
+        """Drop all cached query results after a data-modifying call."""
+        with self._cache_lock:
+            self._result_cache.clear()
+            self._cache_generation += 1
 
     def do_put(self, context, descriptor, reader, writer):
         """
@@ -68,47 +292,98 @@ class DuckDBFlightServer(flight.FlightServerBase):
             reader: The reader containing the data.
             writer: The writer to write results to.
         """
-        table = reader.read_all()
         table_name = descriptor.path[0].decode("utf-8")
+        if not _IDENTIFIER_RE.match(table_name):
+            error_msg = f"Invalid table name: {table_name}"
+            self.logger.error(error_msg)
+            raise flight.FlightServerError(error_msg)
 
-        self.logger.info(
-            f"Received PUT request for table {table_name} with {table.num_rows} rows"
-        )
-
-        # Infer schema from the table
-        schema_fields = []
-        for field in table.schema:
-            field_type = field.type
-            if pa.types.is_integer(field_type):
-                duckdb_type = "BIGINT"
-            elif pa.types.is_floating(field_type):
-                duckdb_type = "DOUBLE"
-            elif pa.types.is_string(field_type):
-                duckdb_type = "VARCHAR"
-            elif pa.types.is_boolean(field_type):
-                duckdb_type = "BOOLEAN"
-            elif pa.types.is_timestamp(field_type):
-                duckdb_type = "TIMESTAMP"
-            elif pa.types.is_date(field_type):
-                duckdb_type = "DATE"
-            else:
-                duckdb_type = "VARCHAR"  # Default to VARCHAR for unknown types
+        cursor = self._cursor()
+        schema_fp = reader.schema.serialize().to_pybytes()
+        with self._write_lock:
+            if self._ddl_cache.get(table_name) != schema_fp:
+                # Let DuckDB infer the column types from an empty Arrow
+                # table with the stream's schema; unlike the old
+                # Python-side type map this keeps narrow types (INT32,
+                # FLOAT, ...) instead of upcasting to BIGINT/DOUBLE.
+                self.logger.debug("Creating table %s from Arrow schema", table_name)
+                cursor.register("_put_schema", reader.schema.empty_table())
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{table_name}" AS '
+                    "SELECT * FROM _put_schema LIMIT 0"
+                )
+                cursor.unregister("_put_schema")
+                self._ddl_cache[table_name] = schema_fp
 
-            schema_fields.append(f"{field.name} {duckdb_type}")
+        # Consume the stream batch by batch instead of read_all(), so a
+        # long-lived PUT stream never materializes on the server. The
+        # write lock is taken per chunk, never across the blocking
+        # network read: a PUT stream held open by a slow (or reusing)
+        # producer must not stall every other writer. Each insert
+        # autocommits, so chunks become visible as they land.
+        total_rows = 0
+        for chunk in reader:
+            with self._write_lock:
+                # Let DuckDB consume the Arrow buffers directly
+                # (zero-copy for supported types).
+                cursor.from_arrow(chunk.data).insert_into(table_name)
+            # Each chunk is visible as soon as it commits, so cached
+            # results go stale per chunk too — a long-lived PUT stream
+            # must not keep serving pre-stream results until it closes.
+            self._invalidate_result_cache()
+            total_rows += chunk.data.num_rows
+        self.logger.debug("Inserted %d rows into table %s", total_rows, table_name)
 
-        # Create table if it doesn't exist
-        schema_sql = ", ".join(schema_fields)
-        self.logger.debug(f"Creating table with schema: {schema_sql}")
-        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({schema_sql})")
+    def do_exchange(self, context, descriptor, reader, writer):
+        """
+        Handle a batched-query exchange.
 
-        # Convert to record batches for better alignment
-        batches = table.to_batches(max_chunksize=1024)
-        aligned_table = pa.Table.from_batches(batches)
-        self.conn.register("temp_table", aligned_table)
+        The client uploads a record batch whose 'sql' column holds one
+        query per row; the response stream carries one (query_id, data)
+        row per query, where data is the IPC-serialized result table.
+        Collapsing N queries into one call saves N-1 gRPC round-trips.
 
-        # Insert new data
-        self.conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp_table")
-        self.logger.info(f"Inserted {table.num_rows} rows into table {table_name}")
+        Args:
+            context: The call context.
+            descriptor: The descriptor for the exchange.
+            reader: The reader carrying the query batch.
+            writer: The writer for the result stream.
+        """
+        queries = reader.read_all().column("sql").to_pylist()
+        self.logger.debug("Executing %d exchanged queries", len(queries))
+        writer.begin(_EXCHANGE_SCHEMA)
+        for query_id, query in enumerate(queries):
+            if _is_read_only(query):
+                rel = self._cursor().sql(query)
+                if rel is not None:
+                    result = rel.fetch_arrow_table()
+                else:
+                    # A write that slipped past _is_read_only already
+                    # executed; surface an empty result and drop any
+                    # cached results it staled.
+                    self._invalidate_result_cache()
+                    result = pa.table({})
+            else:
+                # Same gating as do_action: exchanged statements may be
+                # DDL/DML, so serialize them with other writers and drop
+                # any cached results they may have staled.
+                with self._write_lock:
+                    result = self._cursor().execute(query).fetch_arrow_table()
+                self._invalidate_result_cache()
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, result.schema) as ipc_writer:
+                ipc_writer.write_table(result)
+            writer.write_batch(
+                pa.record_batch(
+                    {
+                        "query_id": pa.array([query_id], type=pa.int32()),
+                        "data": pa.array(
+                            [sink.getvalue().to_pybytes()], type=pa.binary()
+                        ),
+                    }
+                )
+            )
+        writer.close()
 
     def do_action(self, context, action):
         """
@@ -123,8 +398,12 @@ class DuckDBFlightServer(flight.FlightServerBase):
         """
         if action.type == "query":
             query = action.body.to_pybytes().decode("utf-8")
-            self.logger.debug(f"Executing action query: {query}")
-            self.conn.execute(query)
+            self.logger.debug("Executing action query: %s", query)
+            # Action bodies may be DDL/DML, so they serialize with PUTs.
+            with self._write_lock:
+                self._cursor().execute(query)
+            if not _is_read_only(query):
+                self._invalidate_result_cache()
             return []
         else:
             error_msg = f"Unknown action type: {action.type}"
@@ -48,8 +48,11 @@ def flight_server(temp_db_path):
     server_thread = threading.Thread(target=server.serve, daemon=True)
     server_thread.start()
 
-    # Wait for server to start
-    max_attempts = 5
+    # Wait for server to start: the TCP probe returns in microseconds once
+    # the port is open, and the exponential backoff (10 ms, 20 ms, ...,
+    # capped at 1 s) catches a fast-starting server within milliseconds
+    # instead of sleeping a fixed second per attempt.
+    max_attempts = 30
     for attempt in range(max_attempts):
         try:
             # Try to connect to the server
@@ -63,7 +66,7 @@ def flight_server(temp_db_path):
         if attempt == max_attempts - 1:
             pytest.fail(f"Could not connect to server after {max_attempts} attempts")
 
-        time.sleep(1)
+        time.sleep(min(1.0, 0.01 * 2**attempt))
 
     yield {"host": host, "port": port, "db_path": temp_db_path, "server": server}
 
@@ -79,13 +82,17 @@ def flight_client(flight_server):
     return client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_table():
-    """Fixture to create a sample PyArrow table for testing."""
+    """Fixture to create a sample PyArrow table for testing.
+
+    Session-scoped: the table is immutable, so building it once and
+    sharing it across tests is safe and skips per-test construction.
+    """
     data = {
         "id": pa.array([1, 2, 3, 4, 5]),
         "name": pa.array(["Alice", "Bob", "Charlie", "Dave", "Eve"]),
         "value": pa.array([10.1, 20.2, 30.3, 40.4, 50.5]),
         "active": pa.array([True, False, True, True, False]),
     }
-    return pa.Table.from_pydict(data)
+    return pa.table(data)
@@ -108,6 +108,92 @@ class TestClientServerIntegration:
         assert result.column("id")[0].as_py() == 1
         assert result.column("name")[0].as_py() == "test"
 
+    def test_execute_query_stream(self, flight_client, sample_table):
+        """Test consuming query results batch by batch."""
+        # Upload data
+        table_name = "test_stream"
+        success = flight_client.upload_data(table_name, sample_table)
+        assert success is True
+
+        # Consume the result incrementally
+        query = f"SELECT * FROM {table_name}"
+        total_rows = sum(
+            batch.num_rows for batch in flight_client.execute_query_stream(query)
+        )
+
+        assert total_rows == sample_table.num_rows
+
+    def test_execute_queries(self, flight_client, sample_table):
+        """Test executing multiple queries over one exchange."""
+        # Upload data
+        table_name = "test_exchange"
+        success = flight_client.upload_data(table_name, sample_table)
+        assert success is True
+
+        # Execute two queries in a single round-trip
+        results = flight_client.execute_queries(
+            [
+                f"SELECT COUNT(*) as count FROM {table_name}",
+                f"SELECT AVG(value) as avg_value FROM {table_name}",
+            ]
+        )
+
+        # Verify both results came back in order
+        assert results is not None
+        assert len(results) == 2
+        assert results[0].column("count")[0].as_py() == sample_table.num_rows
+        assert "avg_value" in results[1].column_names
+
+    def test_reused_writer_upload(self, flight_server, sample_table):
+        """Test uploading through a reused writer and flushing."""
+        from duck_takes_flight.client import DuckDBFlightClient
+
+        client = DuckDBFlightClient(
+            host=flight_server["host"],
+            port=flight_server["port"],
+            reuse_writers=True,
+        )
+
+        # Two uploads share one PUT stream; flush confirms the server
+        # consumed them (batches are inserted as they arrive)
+        table_name = "test_reused_writer"
+        assert client.upload_data(table_name, sample_table) is True
+        assert client.upload_data(table_name, sample_table) is True
+        client.flush()
+
+        result = client.execute_query(f"SELECT COUNT(*) as count FROM {table_name}")
+        assert result.column("count")[0].as_py() == 2 * sample_table.num_rows
+
+    def test_result_cache_invalidation(self, flight_client, sample_table):
+        """Test that cached query results are dropped after new uploads."""
+        # Upload data and query it twice so the result is served hot
+        table_name = "test_invalidation"
+        assert flight_client.upload_data(table_name, sample_table) is True
+
+        query = f"SELECT COUNT(*) as count FROM {table_name}"
+        first = flight_client.execute_query(query)
+        assert first.column("count")[0].as_py() == sample_table.num_rows
+
+        # A second upload must invalidate the cached count
+        assert flight_client.upload_data(table_name, sample_table) is True
+        second = flight_client.execute_query(query)
+        assert second.column("count")[0].as_py() == 2 * sample_table.num_rows
+
+    def test_upload_invalid_table_name(self, flight_client, sample_table):
+        """Test that non-identifier table names are rejected."""
+        # The server only accepts plain identifiers, so an injection
+        # attempt in the descriptor path must fail the upload
+        result = flight_client.upload_data("bad name; DROP TABLE x;--", sample_table)
+        assert result is False
+
+        # No table may have been created for the malformed name
+        tables = flight_client.execute_query(
+            "SELECT table_name FROM information_schema.tables"
+        )
+        assert all(
+            "bad name" not in name for name in tables.column("table_name").to_pylist()
+        )
+
     def test_error_handling(self, flight_client):
         """Test error handling for invalid queries."""
         # Execute an invalid query
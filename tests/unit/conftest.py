@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pyarrow.flight as flight
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Neutralize time.sleep for every unit test.
+
+    Unit tests must never wait on the wall clock; retry and backoff
+    paths would otherwise add real seconds per run. The requested delays
+    are recorded so tests can assert how often (and how long) the code
+    under test tried to sleep.
+    """
+    calls = []
+    monkeypatch.setattr(time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def mock_flight_client(monkeypatch):
+    """Fixture to create a mocked Flight client.
+
+    monkeypatch installs the replacement with a plain setattr (and a
+    list-pop on teardown), skipping unittest.mock.patch's descriptor
+    machinery. The mock is spec'd against FlightClient so tests touching
+    a nonexistent attribute fail immediately.
+    """
+    mock_client = MagicMock(spec=flight.FlightClient)
+    monkeypatch.setattr(flight, "connect", MagicMock(return_value=mock_client))
+    return mock_client
+
+
+@pytest.fixture
+def client(mock_flight_client):
+    """Fixture to create a DuckDBFlightClient wired to the mocked Flight client.
+
+    Constructing the client (one mocked connect) happens here instead of
+    in every test body, so tests only configure responses and assert.
+    """
+    from duck_takes_flight.client import DuckDBFlightClient
+
+    return DuckDBFlightClient()
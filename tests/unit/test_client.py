@@ -2,128 +2,151 @@
 Unit tests for the DuckDBFlightClient class.
 """
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import polars as pl
 import pyarrow as pa
+import pyarrow.flight as flight
 import pytest
 from pyarrow._flight import FlightUnavailableError
 
-from duck_takes_flight.client import DuckDBFlightClient
+from duck_takes_flight.client import _GRPC_OPTIONS, DuckDBFlightClient
+
+# Tiny immutable result table shared by the query tests; built once at
+# import instead of per test.
+_SMALL_TABLE = pa.Table.from_pydict({"col1": [1, 2, 3]})
+
+
+class TicketEq:
+    """Matcher that compares equal to a flight.Ticket with the given bytes.
+
+    Lets assert_called_once_with check the ticket payload directly
+    instead of digging the argument back out of call_args.
+    """
+
+    def __init__(self, ticket):
+        self.ticket = ticket
+
+    def __eq__(self, other):
+        return other.ticket == self.ticket
 
 
 @pytest.fixture
-def mock_flight_client():
-    """Fixture to create a mocked Flight client."""
-    with patch("pyarrow.flight.connect") as mock_connect:
-        mock_client = MagicMock()
-        mock_connect.return_value = mock_client
-        yield mock_client
+def mock_action(monkeypatch):
+    """Fixture to replace flight.Action with a mocked constructor."""
+    action = MagicMock(return_value=MagicMock())
+    monkeypatch.setattr(flight, "Action", action)
+    return action
 
 
 class TestDuckDBFlightClient:
     """Tests for the DuckDBFlightClient class."""
 
-    def test_init_with_default_params(self):
+    def test_init_with_default_params(self, mock_flight_client):
         """Test client initialization with default parameters."""
-        with patch("pyarrow.flight.connect") as mock_connect:
-            mock_client = MagicMock()
-            mock_connect.return_value = mock_client
-
-            client = DuckDBFlightClient()
+        client = DuckDBFlightClient()
 
-            assert client.location == "grpc://localhost:8815"
-            mock_connect.assert_called_once_with("grpc://localhost:8815")
+        assert client.location == "grpc://localhost:8815"
+        flight.connect.assert_called_once_with(
+            "grpc://localhost:8815", generic_options=_GRPC_OPTIONS
+        )
 
-    def test_init_with_custom_params(self):
+    def test_init_with_custom_params(self, mock_flight_client):
         """Test client initialization with custom parameters."""
-        with patch("pyarrow.flight.connect") as mock_connect:
-            mock_client = MagicMock()
-            mock_connect.return_value = mock_client
-
-            client = DuckDBFlightClient(host="testhost", port=9000)
+        client = DuckDBFlightClient(host="testhost", port=9000)
 
-            assert client.location == "grpc://testhost:9000"
-            mock_connect.assert_called_once_with("grpc://testhost:9000")
+        assert client.location == "grpc://testhost:9000"
+        flight.connect.assert_called_once_with(
+            "grpc://testhost:9000", generic_options=_GRPC_OPTIONS
+        )
 
     def test_connect_with_retry_success_first_attempt(self, mock_flight_client):
         """Test successful connection on first attempt."""
-        with patch("pyarrow.flight.connect") as mock_connect:
-            mock_connect.return_value = mock_flight_client
-
-            client = DuckDBFlightClient()
+        client = DuckDBFlightClient()
 
-            assert mock_connect.call_count == 1
-            assert client.client == mock_flight_client
+        assert flight.connect.call_count == 1
+        assert client.client == mock_flight_client
 
-    def test_connect_with_retry_success_after_failures(self):
+    def test_connect_with_retry_success_after_failures(self, monkeypatch, no_sleep):
         """Test successful connection after failures."""
-        with (
-            patch("pyarrow.flight.connect") as mock_connect,
-            patch("time.sleep") as mock_sleep,
-        ):
-            # Make connect fail twice then succeed
-            mock_connect.side_effect = [
+        # Make connect fail twice then succeed
+        mock_connect = MagicMock(
+            side_effect=[
                 FlightUnavailableError("Server unavailable"),
                 FlightUnavailableError("Server unavailable"),
                 MagicMock(),
             ]
+        )
+        monkeypatch.setattr(flight, "connect", mock_connect)
 
-            client = DuckDBFlightClient()
+        client = DuckDBFlightClient()
 
-            assert mock_connect.call_count == 3
-            assert mock_sleep.call_count == 2
-            assert client.client is not None
+        assert mock_connect.call_count == 3
+        assert len(no_sleep) == 2
+        assert client.client is not None
 
-    def test_connect_with_retry_all_failures(self):
+    def test_connect_with_retry_all_failures(self, monkeypatch, no_sleep):
         """Test connection failure after max attempts."""
-        with (
-            patch("pyarrow.flight.connect") as mock_connect,
-            patch("time.sleep") as mock_sleep,
-        ):
-            # Make connect fail all times
-            mock_connect.side_effect = FlightUnavailableError("Server unavailable")
+        # Make connect fail all times
+        mock_connect = MagicMock(
+            side_effect=FlightUnavailableError("Server unavailable")
+        )
+        monkeypatch.setattr(flight, "connect", mock_connect)
 
-            with pytest.raises(FlightUnavailableError):
-                DuckDBFlightClient(max_attempts=3)
+        with pytest.raises(FlightUnavailableError):
+            DuckDBFlightClient(max_attempts=3)
 
-            assert mock_connect.call_count == 3
-            assert mock_sleep.call_count == 2
+        assert mock_connect.call_count == 3
+        assert len(no_sleep) == 2
 
-    def test_execute_query(self, mock_flight_client):
+    def test_execute_query(self, client, mock_flight_client):
         """Test query execution."""
-        # Setup mock response
-        mock_reader = MagicMock()
-        mock_result = pa.Table.from_pydict({"col1": [1, 2, 3]})
-        mock_reader.read_all.return_value = mock_result
+        # Setup mock response; nothing is asserted on the reader itself,
+        # so a plain namespace stub is enough.
+        mock_result = _SMALL_TABLE
+        mock_reader = SimpleNamespace(read_all=lambda: mock_result)
         mock_flight_client.do_get.return_value = mock_reader
 
-        client = DuckDBFlightClient()
         result = client.execute_query("SELECT * FROM test")
 
         # Verify the query was executed correctly
-        mock_flight_client.do_get.assert_called_once()
-        ticket_arg = mock_flight_client.do_get.call_args[0][0]
-        assert ticket_arg.ticket == b"SELECT * FROM test"
+        mock_flight_client.do_get.assert_called_once_with(
+            TicketEq(b"SELECT * FROM test")
+        )
         assert result == mock_result
 
-    def test_execute_query_error(self, mock_flight_client):
-        """Test query execution with error."""
+    @pytest.mark.parametrize(
+        ("rpc", "call", "expected"),
+        [
+            ("do_get", lambda c, t: c.execute_query("SELECT * FROM test"), None),
+            ("do_put", lambda c, t: c.upload_data("test_table", t), False),
+            (
+                "do_action",
+                lambda c, t: c.execute_action("query", "CREATE TABLE test"),
+                [],
+            ),
+        ],
+        ids=["execute_query", "upload_data", "execute_action"],
+    )
+    def test_rpc_error_handling(
+        self, client, mock_flight_client, sample_table, rpc, call, expected
+    ):
+        """Test that RPC errors are swallowed and a default is returned."""
         # Setup mock to raise exception
-        mock_flight_client.do_get.side_effect = Exception("Query error")
+        getattr(mock_flight_client, rpc).side_effect = Exception("RPC error")
 
-        client = DuckDBFlightClient()
-        result = client.execute_query("SELECT * FROM test")
+        result = call(client, sample_table)
 
         # Verify error handling
-        assert result is None
+        assert result == expected
 
-    def test_upload_data(self, mock_flight_client, sample_table):
+    def test_upload_data(self, client, mock_flight_client, sample_table):
         """Test data upload."""
         # Setup mock writer
         mock_writer = MagicMock()
         mock_flight_client.do_put.return_value = (mock_writer, None)
 
-        client = DuckDBFlightClient()
         result = client.upload_data("test_table", sample_table)
 
         # Verify the upload was executed correctly
@@ -136,24 +159,27 @@ class TestDuckDBFlightClient:
         mock_writer.close.assert_called_once()
         assert result is True
 
-    def test_upload_data_error(self, mock_flight_client, sample_table):
-        """Test data upload with error."""
-        # Setup mock to raise exception
-        mock_flight_client.do_put.side_effect = Exception("Upload error")
+    def test_upload_batch(self, client, mock_flight_client, sample_table):
+        """Test record batch upload."""
+        # Setup mock writer
+        mock_writer = MagicMock()
+        mock_flight_client.do_put.return_value = (mock_writer, None)
+        batch = sample_table.to_batches()[0]
 
-        client = DuckDBFlightClient()
-        result = client.upload_data("test_table", sample_table)
+        result = client.upload_batch("test_table", batch)
 
-        # Verify error handling
-        assert result is False
+        # Verify the batch was written without a Table wrapper
+        mock_flight_client.do_put.assert_called_once()
+        mock_writer.write_batch.assert_called_once_with(batch)
+        mock_writer.close.assert_called_once()
+        assert result is True
 
-    def test_execute_action(self, mock_flight_client):
+    def test_execute_action(self, client, mock_flight_client):
         """Test action execution."""
         # Setup mock response
         mock_results = [b"result1", b"result2"]
         mock_flight_client.do_action.return_value = mock_results
 
-        client = DuckDBFlightClient()
         results = client.execute_action("query", "CREATE TABLE test")
 
         # Verify the action was executed correctly
@@ -163,100 +189,79 @@ class TestDuckDBFlightClient:
         assert action_arg.body == b"CREATE TABLE test"
         assert results == mock_results
 
-    @patch("duck_takes_flight.client.flight.Action")
-    def test_execute_action_no_body(self, mock_action):
+    def test_execute_action_no_body(self, client, mock_action, mock_flight_client):
         """Test action execution with no body."""
-        # Create a mock action
-        mock_action_instance = MagicMock()
-        mock_action.return_value = mock_action_instance
-
-        # Create a mock client
-        with patch("pyarrow.flight.connect") as mock_connect:
-            mock_client = MagicMock()
-            mock_connect.return_value = mock_client
+        mock_action_instance = mock_action.return_value
 
-            # Setup mock response
-            mock_results = [b"result1", b"result2"]
-            mock_client.do_action.return_value = mock_results
-
-            # Create client and call method
-            client = DuckDBFlightClient()
-            results = client.execute_action("list_tables")
-
-            # Verify the action was created correctly
-            mock_action.assert_called_once_with("list_tables", None)
-
-            # Verify do_action was called with our mock action
-            mock_client.do_action.assert_called_once_with(mock_action_instance)
+        # Setup mock response
+        mock_results = [b"result1", b"result2"]
+        mock_flight_client.do_action.return_value = mock_results
 
-            # Verify results
-            assert results == mock_results
+        results = client.execute_action("list_tables")
 
-    def test_execute_action_error(self, mock_flight_client):
-        """Test action execution with error."""
-        # Setup mock to raise exception
-        mock_flight_client.do_action.side_effect = Exception("Action error")
+        # Verify the action was created correctly
+        mock_action.assert_called_once_with("list_tables", None)
 
-        client = DuckDBFlightClient()
-        results = client.execute_action("query", "CREATE TABLE test")
+        # Verify do_action was called with our mock action
+        mock_flight_client.do_action.assert_called_once_with(mock_action_instance)
 
-        # Verify error handling
-        assert results == []
+        # Verify results
+        assert results == mock_results
 
-    def test_execute_query_to_polars(self, mock_flight_client):
+    def test_execute_query_to_polars(self, monkeypatch, client, mock_flight_client):
         """Test query execution with conversion to Polars DataFrame."""
-        # Setup mock response
-        mock_reader = MagicMock()
-        mock_result = pa.Table.from_pydict({"col1": [1, 2, 3]})
-        mock_reader.read_all.return_value = mock_result
+        # Setup mock response; the reader is never asserted on directly.
+        mock_result = _SMALL_TABLE
+        mock_reader = SimpleNamespace(read_all=lambda: mock_result)
         mock_flight_client.do_get.return_value = mock_reader
 
-        with patch("polars.from_arrow") as mock_from_arrow:
-            # Setup mock polars conversion
-            mock_df = MagicMock()
-            mock_df.__len__.return_value = 3
-            mock_from_arrow.return_value = mock_df
+        # Setup mock polars conversion
+        mock_df = MagicMock()
+        mock_df.__len__.return_value = 3
+        mock_from_arrow = MagicMock(return_value=mock_df)
+        monkeypatch.setattr(pl, "from_arrow", mock_from_arrow)
 
-            client = DuckDBFlightClient()
-            result = client.execute_query_to_polars("SELECT * FROM test")
+        result = client.execute_query_to_polars("SELECT * FROM test")
 
-            # Verify the query was executed correctly
-            mock_flight_client.do_get.assert_called_once()
-            ticket_arg = mock_flight_client.do_get.call_args[0][0]
-            assert ticket_arg.ticket == b"SELECT * FROM test"
+        # Verify the query was executed correctly
+        mock_flight_client.do_get.assert_called_once_with(
+            TicketEq(b"SELECT * FROM test")
+        )
 
-            # Verify the arrow table was converted to polars
-            mock_from_arrow.assert_called_once_with(mock_result)
-            assert result == mock_df
+        # Verify the arrow table was converted to polars without a copy
+        mock_from_arrow.assert_called_once_with(mock_result, rechunk=False)
+        assert result == mock_df
 
-    def test_execute_query_to_polars_none_result(self, mock_flight_client):
+    def test_execute_query_to_polars_none_result(self, monkeypatch, client):
         """Test query execution with None result from execute_query."""
         # Setup mock to return None from execute_query
-        with patch.object(DuckDBFlightClient, "execute_query", return_value=None):
-            with patch("polars.DataFrame") as mock_df_constructor:
-                mock_empty_df = MagicMock()
-                mock_df_constructor.return_value = mock_empty_df
+        monkeypatch.setattr(
+            DuckDBFlightClient, "execute_query", MagicMock(return_value=None)
+        )
+        mock_empty_df = MagicMock()
+        mock_df_constructor = MagicMock(return_value=mock_empty_df)
+        monkeypatch.setattr(pl, "DataFrame", mock_df_constructor)
 
-                client = DuckDBFlightClient()
-                result = client.execute_query_to_polars("SELECT * FROM test")
+        result = client.execute_query_to_polars("SELECT * FROM test")
 
-                # Verify error handling - empty DataFrame should be created
-                mock_df_constructor.assert_called_once()
-                assert result == mock_empty_df
+        # Verify error handling - empty DataFrame should be created
+        mock_df_constructor.assert_called_once()
+        assert result == mock_empty_df
 
-    def test_execute_query_to_polars_error(self, mock_flight_client):
+    def test_execute_query_to_polars_error(self, monkeypatch, client):
         """Test query execution to polars with error."""
         # Setup mock to raise exception
-        with patch.object(DuckDBFlightClient, "execute_query") as mock_execute_query:
-            mock_execute_query.side_effect = Exception("Query error")
-
-            with patch("polars.DataFrame") as mock_df_constructor:
-                mock_empty_df = MagicMock()
-                mock_df_constructor.return_value = mock_empty_df
-
-                client = DuckDBFlightClient()
-                result = client.execute_query_to_polars("SELECT * FROM test")
-
-                # Verify error handling - empty DataFrame should be created
-                mock_df_constructor.assert_called_once()
-                assert result == mock_empty_df
+        monkeypatch.setattr(
+            DuckDBFlightClient,
+            "execute_query",
+            MagicMock(side_effect=Exception("Query error")),
+        )
+        mock_empty_df = MagicMock()
+        mock_df_constructor = MagicMock(return_value=mock_empty_df)
+        monkeypatch.setattr(pl, "DataFrame", mock_df_constructor)
+
+        result = client.execute_query_to_polars("SELECT * FROM test")
+
+        # Verify error handling - empty DataFrame should be created
+        mock_df_constructor.assert_called_once()
+        assert result == mock_empty_df
@@ -2,9 +2,8 @@
 Unit tests for the DuckDBFlightServer class.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
-import duckdb
 import pyarrow as pa
 import pyarrow.flight as flight
 import pytest
@@ -12,19 +11,32 @@ import pytest
 # Import the serve function directly, but not the DuckDBFlightServer class
 from duck_takes_flight.server import serve
 
+# Tiny immutable result table shared by the query tests; built once at
+# import instead of per test.
+_SMALL_TABLE = pa.Table.from_pydict({"col1": [1, 2, 3]})
+
 
 # Create a mock version of the server class for testing
 class MockDuckDBFlightServer:
-    def __init__(self, location="grpc://localhost:8815", db_path="duck_flight.db"):
+    def __init__(
+        self, location="grpc://localhost:8815", db_path="duck_flight.db", conn=None
+    ):
         self.location = location
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path)
+        # Accept an injected connection so tests can hand in a mock
+        # without patching duckdb.connect for every test.
+        if conn is None:
+            # Imported lazily: most tests inject a mock connection, so
+            # collecting this module never pays for loading duckdb.
+            import duckdb
+
+            conn = duckdb.connect(db_path)
+        self.conn = conn
 
     def do_get(self, context, ticket):
         query = ticket.ticket.decode("utf-8")
         result_table = self.conn.execute(query).fetch_arrow_table()
-        batches = result_table.to_batches(max_chunksize=1024)
-        return flight.RecordBatchStream(pa.Table.from_batches(batches))
+        return flight.RecordBatchStream(result_table)
 
     def do_put(self, context, descriptor, reader, writer):
         table = reader.read_all()
@@ -54,14 +66,19 @@ class MockDuckDBFlightServer:
         pass
 
 
+@pytest.fixture
+def mock_conn():
+    """Fixture to create a mocked DuckDB connection."""
+    return MagicMock()
+
+
 class TestDuckDBFlightServer:
     """Tests for the DuckDBFlightServer class."""
 
-    @patch("duckdb.connect")
-    def test_init(self, mock_connect):
-        """Test server initialization."""
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+    def test_init(self, monkeypatch):
+        """Test server initialization opens a connection by default."""
+        mock_connect = MagicMock(return_value=MagicMock())
+        monkeypatch.setattr("duckdb.connect", mock_connect)
 
         server = MockDuckDBFlightServer(
             location="grpc://testhost:9000", db_path="test.db"
@@ -71,27 +88,27 @@ class TestDuckDBFlightServer:
         assert server.db_path == "test.db"
         assert server.location == "grpc://testhost:9000"
 
-    @patch("duckdb.connect")
-    @patch("pyarrow.flight.RecordBatchStream")
-    def test_do_get(self, mock_stream, mock_connect):
+    def test_init_with_injected_conn(self, mock_conn):
+        """Test server initialization with an injected connection."""
+        server = MockDuckDBFlightServer(db_path="test.db", conn=mock_conn)
+
+        assert server.conn is mock_conn
+
+    def test_do_get(self, monkeypatch, mock_conn):
         """Test do_get method."""
-        # Setup mock connection and query result
-        mock_conn = MagicMock()
+        mock_stream = MagicMock(return_value=MagicMock())
+        monkeypatch.setattr(flight, "RecordBatchStream", mock_stream)
+
+        # Setup mock query result
         mock_execute = MagicMock()
         mock_conn.execute.return_value = mock_execute
-        mock_execute.fetch_arrow_table.return_value = pa.Table.from_pydict(
-            {"col1": [1, 2, 3]}
-        )
-        mock_connect.return_value = mock_conn
+        mock_execute.fetch_arrow_table.return_value = _SMALL_TABLE
 
         # Create server and test context
-        server = MockDuckDBFlightServer(db_path="test.db")
+        server = MockDuckDBFlightServer(db_path="test.db", conn=mock_conn)
         context = MagicMock()
         ticket = flight.Ticket(b"SELECT * FROM test")
 
-        # Setup mock stream
-        mock_stream.return_value = MagicMock()
-
         # Call do_get
         server.do_get(context, ticket)
 
@@ -99,64 +116,39 @@ class TestDuckDBFlightServer:
         mock_conn.execute.assert_called_once_with("SELECT * FROM test")
         mock_execute.fetch_arrow_table.assert_called_once()
 
-    @patch("duckdb.connect")
-    def test_do_put(self, mock_connect):
+    def test_do_put(self, mock_conn, sample_table):
         """Test do_put method."""
-        # Setup mock connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
         # Create server and test data
-        server = MockDuckDBFlightServer(db_path="test.db")
+        server = MockDuckDBFlightServer(db_path="test.db", conn=mock_conn)
         context = MagicMock()
         descriptor = flight.FlightDescriptor.for_path("test_table")
 
-        # Create a sample table
-        data = {
-            "id": pa.array([1, 2, 3]),
-            "name": pa.array(["Alice", "Bob", "Charlie"]),
-            "value": pa.array([10.1, 20.2, 30.3]),
-        }
-        table = pa.Table.from_pydict(data)
-
         # Mock reader and writer
         reader = MagicMock()
-        reader.read_all.return_value = table
+        reader.read_all.return_value = sample_table
         writer = MagicMock()
 
         # Call do_put
         server.do_put(context, descriptor, reader, writer)
 
-        # Verify the table was created and data was inserted
+        # Verify the table was created and data was inserted: one pass
+        # over the recorded calls instead of one scan per statement.
         assert mock_conn.execute.call_count >= 2
-        # Check for CREATE TABLE call
-        create_call_found = False
-        for call_args in mock_conn.execute.call_args_list:
-            if "CREATE TABLE IF NOT EXISTS" in call_args[0][0]:
-                create_call_found = True
-                break
-        assert create_call_found, "CREATE TABLE call not found"
-
-        # Check for INSERT call
-        insert_call_found = False
-        for call_args in mock_conn.execute.call_args_list:
-            if "INSERT INTO" in call_args[0][0]:
-                insert_call_found = True
-                break
-        assert insert_call_found, "INSERT INTO call not found"
+        executed = [call_args[0][0] for call_args in mock_conn.execute.call_args_list]
+        assert any(
+            "CREATE TABLE IF NOT EXISTS" in sql for sql in executed
+        ), "CREATE TABLE call not found"
+        assert any(
+            "INSERT INTO" in sql for sql in executed
+        ), "INSERT INTO call not found"
 
         # Verify register was called
-        mock_conn.register.assert_called_once_with("temp_table", table)
+        mock_conn.register.assert_called_once_with("temp_table", sample_table)
 
-    @patch("duckdb.connect")
-    def test_do_action_query(self, mock_connect):
+    def test_do_action_query(self, mock_conn):
         """Test do_action method with query action."""
-        # Setup mock connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
         # Create server and test action
-        server = MockDuckDBFlightServer(db_path="test.db")
+        server = MockDuckDBFlightServer(db_path="test.db", conn=mock_conn)
         context = MagicMock()
         action = flight.Action("query", b"CREATE TABLE test (id INT)")
 
@@ -167,15 +159,10 @@ class TestDuckDBFlightServer:
         mock_conn.execute.assert_called_once_with("CREATE TABLE test (id INT)")
         assert results == []
 
-    @patch("duckdb.connect")
-    def test_do_action_unknown(self, mock_connect):
+    def test_do_action_unknown(self, mock_conn):
         """Test do_action method with unknown action type."""
-        # Setup mock connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
         # Create server and test action
-        server = MockDuckDBFlightServer(db_path="test.db")
+        server = MockDuckDBFlightServer(db_path="test.db", conn=mock_conn)
         context = MagicMock()
         action = flight.Action("unknown", b"test")
 
@@ -184,12 +171,22 @@ class TestDuckDBFlightServer:
             server.do_action(context, action)
 
 
-@patch("duck_takes_flight.server.DuckDBFlightServer")
+@pytest.fixture(scope="module")
+def mock_server_class():
+    """Fixture to replace DuckDBFlightServer for serve() tests.
+
+    Module-scoped so the patch is installed and torn down once for this
+    module rather than around every test that drives serve().
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        server_class = MagicMock()
+        mp.setattr("duck_takes_flight.server.DuckDBFlightServer", server_class)
+        yield server_class
+
+
 def test_serve(mock_server_class):
     """Test the serve function."""
-    # Setup mock server
-    mock_server = MagicMock()
-    mock_server_class.return_value = mock_server
+    mock_server = mock_server_class.return_value
 
     # Call serve
     serve(db_path="test.db", host="testhost", port=9000)